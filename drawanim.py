@@ -5,66 +5,120 @@
 # See LICENSE file for details.
 
 import sys
+import threading
+from math import floor, ceil
+from itertools import chain
+from collections import deque
 import matplotlib.pyplot as plt
 import numpy as np
 from enum import Enum
-from time import time, sleep, perf_counter
+from time import time, sleep, perf_counter, perf_counter_ns
 from matplotlib.axis import XAxis, YAxis
 from matplotlib.legend import Legend
 from matplotlib.spines import Spine
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.lines import Line2D
+from matplotlib.backend_bases import FigureCanvasBase
 import matplotlib 
 
 
+# artist types that are always treated as static, the XAxis and YAxis are added
+# in open() unless they have been marked as dynamic
+_STATIC_TYPES = (Legend, Spine, )
+
+# XAxis.get_label() and YAxis.get_label() return the axis label Text, get_label() uses the
+# artist _label for these types and falls back to the type name
+_LABEL_FALLBACK = {XAxis: 'XAxis', YAxis: 'YAxis', }
+
+# pixels added around each dynamic artist extent when blitting extents, get_window_extent() 
+# does not include the line width or antialiasing
+_EXTENT_PAD = 4
+
+# the default draw_loop() budget, a quarter of pause_time. A budget of None means no limit as it does for draw().
+_PAUSE_BUDGET = object()
+
+# end a resize wait after this long without a resize event if the resize timer has not fired
+_RESIZE_TIMEOUT_NS = 200_000_000
+
+# draw the figure directly if the draw event from draw_idle() has not arrived after this long,
+# e.g. the caller is not running the GUI event loop between draw() calls
+_DRAW_TIMEOUT_NS = 200_000_000
+
+
+# DrawTimes - record of the time spent in each named draw step, the caller does the
+# timing inline with perf_counter_ns() and passes the result to add()
+# Each name has a single [total_ns, last_ns, count, type] record that is updated in place,
+# the times are kept as integer nanoseconds and only converted to seconds in print_summary().
 class DrawTimes:
+    __slots__ = ('_drawrecords', )
+
     def __init__(self,):
-        self._drawtimes = {}
-        self._drawcount = {}
-        self._drawlast = {}
-        self._drawtypes = {}
-        self.t0 = None
-        self.name = self.type = None
-        self.elapsed = 0
-
-    def __enter__(self):
-        self.t0 = perf_counter()
-        self.name = None
-        return self
-
-
-    def __exit__(self, type, value, traceback):
-        #print('drawtimes[%s].__exit__ name: %s' % (id(self), self.name), file=sys.stderr)
-        if self.name is None:
+        self._drawrecords = {}
+
+    def add(self, name, type, elapsed_ns, t1_ns):
+        record = self._drawrecords.get(name)
+        if record is None:
+            self._drawrecords[name] = [elapsed_ns, t1_ns, 1, type]
             return
-        t1 = perf_counter()
-        self.elapsed = t1 - self.t0
-        if self.name not in self._drawtimes:
-            self._drawtimes[self.name] = self._drawlast[self.name] = 0. 
-            self._drawcount[self.name] = 0
-            self._drawtypes[self.name] = None
-        self._drawtimes[self.name] += self.elapsed
-        self._drawlast[self.name] = t1
-        self._drawcount[self.name] += 1
-        self._drawtypes[self.name] = self.type
-        self.name = self.type = None
+        record[0] += elapsed_ns
+        record[1] = t1_ns
+        record[2] += 1
+        record[3] = type
         
     def print_summary(self, name=''):
-        # show draw times
-        total_time = sum(self._drawtimes.values())
+        # show draw times, the totals and counts are gathered into parallel arrays so that the
+        # averages, percentages and sort order are computed with numpy
+        names = list(self._drawrecords.keys())
+        records = list(self._drawrecords.values())
+        totals = np.fromiter((r[0] for r in records), dtype=np.int64, count=len(names)) / 1e9     # total - total time spent drawing
+        counts = np.fromiter((r[2] for r in records), dtype=np.int64, count=len(names))  # count - number of times drawn
+        total_time = totals.sum()
+        # nothing timed, e.g. no frames drawn or open() was called with profile_draw_times=False
+        if total_time <= 0:
+            return
         #print('draw_animated[%s] total time: %7.2f' % (id(self), total_time), file=sys.stderr)
-        drawinfo = [(
-            self._drawtimes[k] / self._drawcount[k] if self._drawcount[k] > 0 else 0.,  # avg - average time per draw
-            self._drawtimes[k],                        # total - total time spent drawing 
-            self._drawcount[k],                        # count - number of times drawn 
-            str(k),                                    # name - name of artist 
-            self._drawtypes[k],                        # type - type of artist
-        ) for k in self._drawtimes.keys()]
-        total_pc = 0    
-        for avg, total, count, artist, type in sorted(drawinfo, key=lambda x: x[1], reverse=True):
-            pc = 100.0*total/total_time
-            total_pc += pc
-            if count > 0:
+        avgs = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)        # avg - average time per draw
+        order = np.argsort(-totals, kind='stable')
+        pcs = 100.0 * totals[order] / total_time
+        total_pcs = np.cumsum(pcs)
+        for i, pc, total_pc in zip(order, pcs, total_pcs):
+            if counts[i] > 0:
                 print('draw_animated %s %5d | %7.2f %4.1f%% %4.0f%% | %7.2f | %10s | %s' % (
-                    name, count, total, pc, total_pc, avg, type, artist,),  file=sys.stderr) 
+                    name, counts[i], totals[i], pc, total_pc, avgs[i], records[i][3], str(names[i]),),  file=sys.stderr) 
+
+
+# _artist_extent - the display extent of a dynamic artist, Collection.get_window_extent() does not
+# give a usable extent so for scatter plots (PathCollection) and LineCollection the extent is computed
+# from the transformed offsets or segments, padded by the marker size and line width. 
+# Returns None if the artist has nothing to draw.
+def _artist_extent(a, renderer):
+    if isinstance(a, PathCollection):
+        points = a.get_offset_transform().transform(np.ma.getdata(a.get_offsets()))
+        sizes = a.get_sizes()
+        pad = np.sqrt(sizes.max()) / 2 if len(sizes) else 0.
+    elif isinstance(a, LineCollection):
+        paths = a.get_paths()
+        if not paths:
+            return None
+        points = a.get_transform().transform(np.concatenate([p.vertices for p in paths]))
+        pad = 0.
+    else:
+        return a.get_window_extent(renderer)
+    points = points[np.isfinite(points).all(axis=1)]
+    if not len(points):
+        return None
+    linewidths = a.get_linewidths()
+    pad += linewidths.max() / 2 if len(linewidths) else 0.
+    (x0, y0), (x1, y1) = points.min(axis=0), points.max(axis=0)
+    return Bbox.from_extents(x0, y0, x1, y1).padded(renderer.points_to_pixels(pad))
+
+
+# _set_all_animated - mark all of the artists as animated
+def _set_all_animated(artists):
+    for a in artists:
+        a.set_animated(True)
 
 
 # Draw Animated with Blitting
@@ -76,6 +130,20 @@ class DrawTimes:
 # to reduce latency and improve responsiveness of the GUI.
 #
 class DrawAnimated:
+    __slots__ = (
+        'fig', 'name', 'debug', 'first', 'draw_state', 'drawtimes', 'fps_info', '_fps',
+        'xaxis_dynamic', 'yaxis_dynamic', 'extra_static_artists', 'dirty_axes', 'blit_extents',
+        'profile_draw_times', '_mpl_connect',
+        '_canvas', '_bbox', '_blit', '_copy_from_bbox', '_restore_region', '_flush_events', '_draw_artist', '_pause',
+        '_bg_base', '_bg_static', '_bg_size', '_resize_done', '_resize_timer', '_resize_ns', '_wait_reason', '_wait_ns',
+        'current_animated_artists', 'static_animated_artists', 'dynamic_animated_artists', 
+        '_artist_names', '_artists_dirty', '_static_types', '_type_is_static', 
+        '_static_cache', '_dynamic_cache', '_dynamic_by_axes', '_dirty_axes',
+        '_draw_idx', '_draw_dispatch', '_blit_bboxes', '_artist_extents', '_frame_extents',
+        '_chrome_artists', '_static_extents',
+        'blit_times', '_sum_static_draws', '_sum_dynamic_draws', 'static_draws', 'dynamic_draws', 
+        'avg_static_draws', 'avg_dynamic_draws', 'static_artists', 'dynamic_artists', 
+    )
 
     class DrawState(Enum):
         CREATED = 0
@@ -92,86 +160,229 @@ class DrawAnimated:
         WAITING = 11
 
 
-    def xprint(self, msg, always=False):
-        if always or self.debug:
-            print('draw_animated[%s:%8.4f] %s %s' % (id(self.fig), perf_counter(), self.draw_state.name, msg), file=sys.stderr, )
+    # xprint - print a debug message, the message is only formatted with args if it will be printed,
+    # so callers should pass the % args rather than a pre-formatted message.
+    def xprint(self, fmt, *args, always=False):
+        if not (always or self.debug):
+            return
+        msg = fmt % args if args else fmt
+        print('draw_animated[%s:%8.4f] %s %s' % (id(self.fig), perf_counter(), self.draw_state.name, msg), file=sys.stderr, )
 
 
     def __init__(self, fig, name=''):
         self.fig = fig
         self.debug = False
-        self.xprint('fig: %s' % (id(fig)), always=False)
+        self.xprint('fig: %s', id(fig), always=False)
         self._bg_base = self._bg_static = None
+        self._bg_size = None
         self.debug = False
-        self.current_animated_artists = []
+        self.current_animated_artists = ()
+        self._artist_names = {}
         self._mpl_connect = []
         self.draw_state = self.DrawState.CREATED
-        self.blit_times = []
+        self.blit_times = deque()
+        self._sum_static_draws = self._sum_dynamic_draws = 0
         self.static_draws = self.dynamic_draws = self.avg_static_draws = self.avg_dynamic_draws = self.static_artists = self.dynamic_artists = 0
         self.first = True
         self._fps = 0
         self.drawtimes = DrawTimes()
-        self.wait_count = 0
+        self._resize_done = threading.Event()
+        self._resize_done.set()
+        self._resize_timer = None
+        self._resize_ns = 0
+        self._wait_ns = 0
+        self._wait_reason = None
         self.name = name
-
-    def reset(self, info, ):
+        self._artists_dirty = True
+        self._static_types = _STATIC_TYPES
+        self._type_is_static = {}
+        self._static_cache = self._dynamic_cache = ()
+        self.static_animated_artists = self.dynamic_animated_artists = ()
+        self._draw_idx = 0
+        self._blit_bboxes = ()
+        self.dirty_axes = False
+        self._dirty_axes = set()
+        self._dynamic_by_axes = {}
+        self.blit_extents = False
+        self.profile_draw_times = True
+        self._artist_extents = {}
+        self._frame_extents = None
+        self._chrome_artists = ()
+        self._static_extents = {}
+        self._bind_canvas()
+        self._draw_dispatch = {
+            self.DrawState.START: self._draw_start,
+            self.DrawState.DYNAMIC: self._draw_dynamic,
+            self.DrawState.BLIT: self._draw_blit,
+            self.DrawState.CLEANUP: self._draw_cleanup,
+            self.DrawState.FLUSH: self._draw_flush,
+            self.DrawState.DONE: self._draw_done,
+            self.DrawState.STATIC: self._draw_static,
+            self.DrawState.RESET: self._draw_reset,
+            self.DrawState.WAITING: self._draw_waiting,
+        }
+
+    # _bind_canvas - cache the canvas, the figure bbox and the canvas methods used on every frame,
+    # they are rebound on resize and draw events in case the figure has been given a new canvas
+    def _bind_canvas(self):
+        canvas = self._canvas = self.fig.canvas
+        self._bbox = self.fig.bbox
+        self._blit = canvas.blit
+        self._copy_from_bbox = canvas.copy_from_bbox
+        self._restore_region = canvas.restore_region
+        self._flush_events = canvas.flush_events
+        self._draw_artist = self.fig.draw_artist
+        # the base class start_event_loop() sleeps in 10ms steps, only use it if the backend has a real event loop
+        if type(canvas).start_event_loop is FigureCanvasBase.start_event_loop:
+            self._pause = sleep
+        else:
+            self._pause = canvas.start_event_loop
+
+    # pause - run the GUI event loop for seconds so that it can process events and paint, 
+    # backends without an event loop just sleep
+    def pause(self, seconds):
+        self._pause(seconds)
+
+    # reset - redraw the static artists on the next frame. scope='all' also rebuilds the lists of animated
+    # artists, scope='limits' keeps them and can be used when only the limits or other properties of the 
+    # existing artists have changed. scope='chrome' only redraws the static Text artists passed in artists,
+    # e.g. a title whose text has changed, all of the static artists are redrawn if that is not possible.
+    def reset(self, info, scope='all', artists=(), ):
+        if scope not in ('all', 'limits', 'chrome'):
+            raise ValueError("reset scope must be 'all', 'limits' or 'chrome', not %r" % (scope, ))
         self.xprint('', )
+        if scope == 'chrome':
+            self._chrome_artists += tuple(artists)
+            self.xprint('%s reset chrome %s ------------------ %s', info, len(self._chrome_artists), self.draw_state, always=False )
+            return
+        if scope == 'all':
+            self._artists_dirty = True
         if self.draw_state == self.DrawState.WAITING:
             return
         self.draw_state = self.DrawState.RESET
         self._bg_static = None
-        self.xprint('%s reset bg_static ------------------ %s' % (info, self.draw_state), always=False )
+        self.xprint('%s reset bg_static ------------------ %s', info, self.draw_state, always=False )
+
+    # _wait - enter WAITING, reason is 'resize' to wait for the resize events to stop or 'draw'
+    # to wait for the draw event after draw_idle()
+    def _wait(self, reason):
+        self.draw_state = self.DrawState.WAITING
+        self._wait_reason = reason
+        self._wait_ns = perf_counter_ns()
 
     def _on_resize(self, event):
         self._bg_base = self._bg_static = None
+        self._artists_dirty = True
+        self._bind_canvas()
         if self.draw_state != self.DrawState.START:
-            self.draw_state = self.DrawState.WAITING
-        self.wait_count = 0
+            self._wait('resize')
+        # wait until there have been no resize events for 50ms, restarting the timer on each event,
+        # the time of the last event is kept for backends where the timer never fires
+        self._resize_ns = perf_counter_ns()
+        self._resize_done.clear()
+        if self._resize_timer is None:
+            self._resize_timer = self._canvas.new_timer(interval=50)
+            self._resize_timer.single_shot = True
+            self._resize_timer.add_callback(self._resize_done.set)
+        self._resize_timer.stop()
+        self._resize_timer.start()
         self.xprint('', )
-        self.xprint('reset resize_event reset bg_base bg_static ------------------ %s' % (self.draw_state), always=False )
+        self.xprint('reset resize_event reset bg_base bg_static ------------------ %s', self.draw_state, always=False )
         #self.reset('on_resize')
 
+    # _on_draw_event - the figure has just been fully drawn, which does not draw the animated artists, 
+    # so the canvas is exactly the base background, save it and redraw the static artists.
+    # N.b. savefig() to another format draws the figure on a temporary canvas, e.g. FigureCanvasPdf,
+    # which cannot copy regions, draw events from any canvas other than the bound canvas are ignored
     def _on_draw_event(self, event):
         #self.reset('on_draw_event')
+        canvas = event.canvas
+        if canvas is not self._canvas or not hasattr(canvas, 'copy_from_bbox'):
+            self.xprint('draw_event ignored canvas: %s', type(canvas).__name__, always=False)
+            return
+        # savefig() to a raster format draws on the bound canvas, possibly at another dpi, that is not 
+        # the base background. At another size the canvas renderer is replaced afterwards, so redraw
+        # the static artists over the base background on the next frame.
+        if canvas.is_saving():
+            bbox = self._bbox
+            if self._bg_size != (bbox.width, bbox.height) and self.draw_state != self.DrawState.WAITING:
+                self.draw_state = self.DrawState.RESET
+                self._bg_static = None
+            self.xprint('draw_event ignored savefig', always=False)
+            return
+        bbox = self._bbox
+        self._bg_base = self._copy_from_bbox(bbox)
+        self._bg_size = (bbox.width, bbox.height)
         self.draw_state = self.DrawState.RESET
         self._bg_static = None
+        self._artists_dirty = True
         self.xprint('', )
-        self.xprint('reset draw_event reset bg_static ------------------ %s' % (self.draw_state), always=False )
+        self.xprint('reset draw_event bg_base = copy_from_bbox reset bg_static ------------------ %s', self.draw_state, always=False )
         #pass
 
     def _on_close_event(self, event):
         pass
 
+    # add_static_artists - treat the artists as static, the static background is redrawn on the
+    # next frame so that it includes them
     def add_static_artists(self, artists):
         self.extra_static_artists += artists
+        self.reset('add_static_artists')
 
     def add_static_artist(self, artist):
         self.extra_static_artists.append(artist)
-
-    def open(self, xaxis_dynamic=False, yaxis_dynamic=False, extra_static_artists=[], debug=False, name=None, ):
+        self.reset('add_static_artist')
+
+    # mark_dirty - mark an axes as having changed dynamic artists, if open() was called with 
+    # dirty_axes=True then only the dirty axes are redrawn on frames that do not draw the static artists
+    # and a frame with no dirty axes is skipped. If ax is None all of the axes are marked dirty.
+    def mark_dirty(self, ax=None):
+        self._dirty_axes.add(id(ax) if ax is not None else None)
+
+    # open - start animating, dirty_axes=True only redraws the axes passed to mark_dirty() on dynamic frames,
+    # blit_extents=True only blits the parts of the dynamic regions covered by the current and previous 
+    # extents of the dynamic artists, which saves copying pixels when the dynamic artists are small,
+    # profile_draw_times=False stops recording the draw times used by print_summary()
+    def open(self, xaxis_dynamic=False, yaxis_dynamic=False, extra_static_artists=[], debug=False, name=None, dirty_axes=False, blit_extents=False, 
+             profile_draw_times=True, ):
         self.draw_state = self.DrawState.OPEN
         self.xaxis_dynamic = xaxis_dynamic
         self.yaxis_dynamic = yaxis_dynamic
-        self.extra_static_artists = extra_static_artists
+        # copy the list, add_static_artist(s) must be used to change it so the artist cache is invalidated
+        self.extra_static_artists = list(extra_static_artists)
         self.debug = debug
+        self.dirty_axes = dirty_axes
+        self._dirty_axes = set()
+        self.blit_extents = blit_extents
+        self._artist_extents = {}
+        self._frame_extents = None
+        self._chrome_artists = ()
+        self._static_extents = {}
+        self.profile_draw_times = profile_draw_times
+        self._static_types = _STATIC_TYPES + ((XAxis,) if not xaxis_dynamic else ()) + ((YAxis,) if not yaxis_dynamic else ())
+        self._type_is_static = {}
+        self._artists_dirty = True
         self.draw_state = self.DrawState.START
         if name is not None:
             self.name = name
         try:
             for e in self._mpl_connect:
-                self.fig.figure.canvas.mpl_disconnect(e)
+                self._canvas.mpl_disconnect(e)
         except:
             pass
         self._mpl_connect = []
 
-        self.bg_base = self.static = None
-        self._mpl_connect.append(self.fig.canvas.mpl_connect('resize_event', self._on_resize))
-        self._mpl_connect.append(self.fig.canvas.mpl_connect('draw_event', self._on_draw_event))
-        self._mpl_connect.append(self.fig.canvas.mpl_connect('close_event', self._on_close_event))
+        self._bind_canvas()
+        canvas = self._canvas
+        self._mpl_connect.append(canvas.mpl_connect('resize_event', self._on_resize))
+        self._mpl_connect.append(canvas.mpl_connect('draw_event', self._on_draw_event))
+        self._mpl_connect.append(canvas.mpl_connect('close_event', self._on_close_event))
 
     def close(self):
+        if self._resize_timer is not None:
+            self._resize_timer.stop()
         for e in self._mpl_connect:
-            self.fig.figure.canvas.mpl_disconnect(e)
+            self._canvas.mpl_disconnect(e)
         self._mpl_connect = []
         self.extra_static_artists = []
 
@@ -180,234 +391,504 @@ class DrawAnimated:
         # animate the title, the axes and the spines
         if title is not None:
             ax.set_title(title, animated=True, )
-        for n, a in ax._axis_map.items():
-            a.set_animated(True)
-            a.set_label(f"{name}-{n}axis")
-            a._label = f"{name}-{n}axis"
-        for n, s in ax.spines.items():
-            s.set_animated(True)
-            s.set_label(f"{name}-{n}-spine")
-        ax.patch.set_animated(True)
+        _set_all_animated(chain(ax._axis_map.values(), ax.spines.values(), (ax.patch, )))
+        # the labels are only used to name the artists in the draw times summary and debug output,
+        # the axis label is set directly as XAxis/YAxis.set_label() is not the artist label
+        if set_label:
+            for n, a in ax._axis_map.items():
+                a._label = f"{name}-{n}axis"
+            for n, s in ax.spines.items():
+                s.set_label(f"{name}-{n}-spine")
         #ax.patch.set_alpha(0.2)
 
     # get_label - helper function to get the label of an artist, needed to handle XAxis and YAxis
     def get_label(self, a):
-        def get_axis_label(a, name):
-            try:
-                return a._label
-            except:
-                return name
-        if type(a) is XAxis:
-            return get_axis_label(a, 'XAxis')
-        if type(a) is YAxis:
-            return get_axis_label(a, 'YAxis')
+        fallback = _LABEL_FALLBACK.get(type(a))
+        if fallback is not None:
+            return getattr(a, '_label', fallback)
         return a.get_label()
 
-    # draw_artists - helper function to draw a list of artists
-    def draw_artists(self, draw_list, info: str = None, ):
-        self.xprint("draw_artists: draw_list: %s" % (len(draw_list)), )
-        while len(draw_list) > 0:
-            a = draw_list.pop(0)
-            self.xprint("draw_artists: draw: %s %s %s %s" % (id(a), info, self.get_label(a), a), )
-            #if a not in self.current_animated_artists:
-            #    continue
-            self.fig.draw_artist(a)
+    # draw_artists - helper function to draw the next artists from a list of artists, 
+    # self._draw_idx is the cursor into the list and is reset when the list is changed.
+    # Artists that have been removed from the figure are skipped, remove() clears the artist figure.
+    # Artists are drawn until the list is exhausted, the time spent exceeds budget or artists_per_tick
+    # artists have been drawn, a budget of 0 draws a single artist, a budget of None does not limit
+    # the time and an artists_per_tick of 0 does not limit the number of artists. 
+    # Each artist draw is recorded in drawtimes if profile_draw_times is set.
+    # Returns the name of the last artist drawn and the number of artists drawn.
+    def draw_artists(self, draw_list, info: str = None, budget=0., artists_per_tick=0, ):
+        if self.debug:
+            self.xprint("draw_artists: draw_list: %s draw_idx: %s", len(draw_list), self._draw_idx, )
+        # bind the attributes used for each artist to locals
+        artist_names = self._artist_names
+        draw_artist = self._draw_artist
+        drawtimes_add = self.drawtimes.add
+        profile_draw_times = self.profile_draw_times
+        debug = self.debug
+        idx = self._draw_idx
+        num_artists = len(draw_list)
+        name = None
+        count = 0
+        budget_ns = int(budget * 1e9) if budget is not None else sys.maxsize
+        t_start = perf_counter_ns()
+        while idx < num_artists:
+            a = draw_list[idx]
+            idx += 1
+            if debug:
+                self.xprint("draw_artists: draw: %s %s %s %s", id(a), info, self.get_label(a), a, )
+            if a.figure is None:
+                continue
+            t0 = perf_counter_ns()
+            draw_artist(a)
+            t1 = perf_counter_ns()
             #self.fig.figure.canvas.blit(self.fig.figure.bbox)
-            return f"{id(a)} {self.get_label(a)}"
+            name = artist_names[id(a)]
+            if profile_draw_times:
+                drawtimes_add(name, info, t1 - t0, t1)
+            count += 1
+            if t1 - t_start >= budget_ns or count == artists_per_tick:
+                break
+        self._draw_idx = idx
+        return name, count
+
+    # _classify_artists - get the list of animated artists that are currently visible and
+    # split them into static and dynamic artists. This walks all of the axes children so the 
+    # result is cached and only rebuilt when the artists may have changed. Effectively new 
+    # artists are ignored until the cache is invalidated by open(), reset(), a resize or a 
+    # draw event, but removed artists are immediately ignored by draw_artists().
+    # N.b. There may be other artists for other types of plots, this code works in my use case. 
+    # N.b. Patch objects need to be drawn before the other static artists, do we need dynamic patches?
+    # YMMV.
+    def _classify_artists(self):
+        # self._type_is_static caches whether each artist type is one of the static types, 
+        # so each artist needs one dict lookup instead of an isinstance() check
+        static_types = self._static_types
+        type_is_static = self._type_is_static
+        extra_static_ids = frozenset(id(a) for a in self.extra_static_artists)
+        static_list = []
+        dynamic_list = []
+        patch_list = []
+        for axes in self.fig._localaxes:
+            patch_id = id(axes.patch)
+            titles = (axes.title, axes._left_title, axes._right_title, )
+            static_ids = extra_static_ids | {id(a) for a in titles}
+            legend = (axes.legend_, ) if axes.legend_ is not None else ()
+            # walk the axes containers directly, in the same order as axes.get_children() 
+            # but without building the list of children
+            for a in chain(axes._children, axes.spines.values(), axes._axis_map.values(), titles, 
+                           axes.child_axes, legend, (axes.patch, )):
+                if a.get_animated() and a.get_visible():
+                    t = type(a)
+                    is_static = type_is_static.get(t)
+                    if is_static is None:
+                        is_static = type_is_static[t] = issubclass(t, static_types)
+                    aid = id(a)
+                    if aid == patch_id:
+                        patch_list.append(a)
+                    elif is_static or aid in static_ids:
+                        static_list.append(a)
+                    else:
+                        dynamic_list.append(a)
+
+        self._static_cache = tuple(patch_list + static_list)
+        self._dynamic_cache = tuple(dynamic_list)
+        self._dynamic_by_axes = {}
+        for a in dynamic_list:
+            self._dynamic_by_axes.setdefault(id(a.axes), []).append(a)
+        self.current_animated_artists = self._static_cache + self._dynamic_cache
+        self._artist_names = {id(a): f"{id(a)} {self.get_label(a)}" for a in self.current_animated_artists}
+        self.static_artists = len(self._static_cache) 
+        self.dynamic_artists = len(self._dynamic_cache) 
+        self._artist_extents = {}
+        self._artists_dirty = False
+        self.xprint("draw_animated: static_artists: %s dynamic_artists: %s", self.static_artists, self.dynamic_artists, always=False,)
+        if self.first:
+            self.xprint("draw_animated: static_animated_artists: %s", len(self._static_cache), )
+            for a in self._static_cache:
+                self.xprint("draw_animated[%s]: static_animated_artists: %s", id(a), a.get_label(), )
+            self.xprint("draw_animated: dynamic_animated_artists: %s", len(self._dynamic_cache), )
+            for a in self._dynamic_cache:
+                self.xprint("draw_animated[%s] dynamic_animated_artists: %s", id(a), a.get_label(), )
+            self.first = False
+
+    # _clip_bbox - get the display bbox an artist is clipped to, None if it is not clipped
+    def _clip_bbox(self, a):
+        if not a.get_clip_on():
+            return None
+        clip_box = a.get_clip_box()
+        if clip_box is not None:
+            return clip_box
+        clip_path = a.get_clip_path()
+        if clip_path is not None:
+            return clip_path.get_fully_transformed_path().get_extents()
         return None
 
-    # draw - do the next step of the animation
-    def draw(self, flush_events=False, ):
-
-        self.xprint(f"draw: draw_state: {self.draw_state}", always=False,)
-        if self.draw_state == self.DrawState.WAITING:
-            sleep(.2)
+    # _dynamic_bboxes - get the regions of the canvas the dynamic artists can draw into, one per 
+    # axes covering the clip boxes of its dynamic artists, as (id(axes), bbox) pairs. If any 
+    # dynamic artist is not clipped then the whole figure is used with an axes id of None.
+    def _dynamic_bboxes(self, bbox):
+        axes_bboxes = {}
+        for a in self.dynamic_animated_artists:
+            clip_bbox = self._clip_bbox(a)
+            if clip_bbox is None:
+                return [(None, bbox.frozen())]
+            axes_bboxes.setdefault(id(a.axes), []).append(clip_bbox)
+        # pad by a pixel to allow for rounding to the pixel grid
+        return [(axes_id, Bbox.intersection(Bbox.union(b).padded(1), bbox)) for axes_id, b in axes_bboxes.items()]
+
+    # The draw state machine, each _draw_<state> method does one step of the animation for
+    # that state and returns (name, type, next state name). draw() looks up the method for the
+    # current state in self._draw_dispatch rather than testing each state in turn.
+
+    # WAITING - waiting for a resize to finish or for the draw event after draw_idle(), return 
+    # immediately so the GUI can process events. A draw event always ends the wait, a resize wait 
+    # also ends when the resize timer fires or, if the backend timer does not run (e.g. Agg), when
+    # there have been no resize events for _RESIZE_TIMEOUT_NS. If the draw event has not arrived 
+    # after _DRAW_TIMEOUT_NS the figure is drawn directly, the draw event then ends the wait.
+    def _draw_waiting(self, flush_events, budget, artists_per_tick):
+        if self._wait_reason == 'draw':
+            if perf_counter_ns() - self._wait_ns >= _DRAW_TIMEOUT_NS:
+                self._wait_ns = perf_counter_ns()
+                self._canvas.draw()
+                return 'draw timeout', None, self.draw_state.name
             return 'waiting', None, self.draw_state.name
-
-        if self.draw_state in [self.DrawState.START, self.DrawState.STATIC, self.DrawState.DYNAMIC, ]: 
-
-            # Get the list of animated artists that are currently visible, this needs to be done
-            # each time because the list of artists can change dynamically. Effectively new artists
-            # are ignored until the next cycle of drawing is started, but removed artists are 
-            # immediately ignored.
-            # N.b. There may be other artists for other types of plots, this code works in my use case. 
-            # N.b. Patch objects need to be drawn before the other static artists, do we need dynamic patches?
-            # YMMV.
-            static_dict = {}
-            dynamic_dict = {}
-            patch_dict = {}
-            for axes in self.fig.get_children():
-                #self.xprint(f"draw: axes: {axes.get_label()}", )
-                if type(axes) is plt.Axes:
-                    for a in axes.get_children():
-                        #self.xprint(f"draw: a: {a.get_label()} animated: {a.get_animated()} visible: {a.get_visible()}", )
-                        if a.get_animated() and a.get_visible():
-                            if a in [axes.patch,]:
-                                patch_dict[id(a)] = a
-                            elif a in self.extra_static_artists:
-                                static_dict[id(a)] = a
-                            elif (type(a) is XAxis and not self.xaxis_dynamic) or (type(a) is YAxis and not self.yaxis_dynamic) or type(a) is Legend or type(a) is Spine:
-                                static_dict[id(a)] = a
-                            elif a in [axes.title, axes._left_title, axes._right_title,]:
-                                static_dict[id(a)] = a
-                            else:
-                                dynamic_dict[id(a)] = a
-
-            #static_animated_artists = [a for a in static_dict.values()] if fig._bg_static is None else []
-            static_animated_artists = [a for a in patch_dict.values()] + [a for a in static_dict.values()] 
-            dynamic_animated_artists = [ a for a in dynamic_dict.values()]
-            current_animated_artists = static_animated_artists + dynamic_animated_artists
-            self.static_artists = len(static_animated_artists) 
-            self.dynamic_artists = len(dynamic_animated_artists) 
-            self.xprint("draw_animated: static_artists: %s dynamic_artists: %s" % (self.static_artists, self.dynamic_artists), always=False,)
-
-            if self.draw_state == self.DrawState.START:
-                self.static_animated_artists = static_animated_artists
-                self.dynamic_animated_artists = dynamic_animated_artists
-            if self.first or self._bg_static is None or self._bg_base is None:
-                self.xprint(f"draw_animated: static_animated_artists: {len(static_animated_artists)}")
-                for a in static_animated_artists:
-                    self.xprint(f"draw_animated[{id(a)}]: static_animated_artists: {a.get_label()}")
-                self.xprint(f"draw_animated: dynamic_animated_artists: {len(dynamic_animated_artists)}")
-                for a in dynamic_animated_artists:
-                    self.xprint(f"draw_animated[{id(a)}] dynamic_animated_artists: {a.get_label()}")
-                self.first = False
-            #self.xprint("draw_animated: current_animated_artists: %s" % (len(current_animated_artists)), )
-            #self.xprint("draw_animated: static_animated_artists: %s" % (len(static_animated_artists)), )
-            #self.xprint("draw_animated: dynamic_animated_artists: %s" % (len(dynamic_animated_artists)), )
-
-        # RESET - clear the static background so it will be redrawn
-        if self.draw_state == self.DrawState.RESET:
-            self.draw_state = self.DrawState.START
-            #self._bg_base = None
+        if self._wait_reason == 'resize' and (
+                self._resize_done.is_set() or perf_counter_ns() - self._resize_ns >= _RESIZE_TIMEOUT_NS):
+            self.draw_state = self.DrawState.RESET
+            return 'resized', None, self.draw_state.name
+        return 'waiting', None, self.draw_state.name
+
+    # RESET - clear the static background so it will be redrawn
+    def _draw_reset(self, flush_events, budget, artists_per_tick):
+        self.draw_state = self.DrawState.START
+        #self._bg_base = None
+        self._bg_static = None
+        return 'reset', None, self.draw_state.name
+
+    # START - ensure we have base background and determine if we need to draw static artists
+    # or can just draw the dynamic artists
+    def _draw_start(self, flush_events, budget, artists_per_tick):
+        bbox = self._bbox
+
+        # refresh the artist lists from the cache, the cache is only rebuilt when
+        # it has been invalidated by open(), reset(), a resize or a draw event.
+        if self._artists_dirty:
+            self._classify_artists()
+        static_animated_artists = self.static_animated_artists = self._static_cache
+        dynamic_animated_artists = self.dynamic_animated_artists = self._dynamic_cache
+        self._draw_idx = 0
+        dirty_axes, self._dirty_axes = self._dirty_axes, set()
+
+        # a resize may not have been seen yet, backgrounds saved at a different size cannot be restored
+        if self._bg_base is not None and self._bg_size != (bbox.width, bbox.height):
+            return self._bg_size_changed()
+
+        if self.debug:
+            self.xprint('_bg_base: %s _bg_static: %s', self._bg_base, self._bg_static, )
+            self.xprint("len(static_animated_artists): %s len(dynamic_animated_artists): %s", len(static_animated_artists), len(dynamic_animated_artists), )
+        self.dynamic_draws = self.static_draws = 0
+        # the static artists extend outside of the axes so a frame that draws them blits the 
+        # whole figure, a dynamic only frame just blits the dynamic regions
+        self._blit_bboxes = (bbox, )
+        self._frame_extents = None
+        # if we don't have a base background, ask for the figure to be drawn, the draw event saves 
+        # the base background. The canvas is not copied here as it may not have been drawn yet or 
+        # may contain the animated artists from the last frame.
+        # N.b. on a non-interactive canvas draw_idle() draws immediately and the draw event has 
+        # already moved us to RESET when it returns
+        if self._bg_base is None:
+            self.xprint('reset bg_base: %s bg_static: %s', self._bg_base, self._bg_static, always=False)
             self._bg_static = None
-            return 'reset', None, self.draw_state.name
-
-        # START - ensure we have base background and determine if we need to draw static artists
-        # or can just draw the dynamic artists
-        if self.draw_state == self.DrawState.START:
-
-            self.xprint('_bg_base: %s _bg_static: %s' % (self._bg_base, self._bg_static), )
-            self.xprint("len(static_animated_artists): %s len(dynamic_animated_artists): %s" % (len(static_animated_artists), len(dynamic_animated_artists)), )
-            self.dynamic_draws = self.static_draws = 0
-            # if we don't have a static background, save the base and draw the static artists
-            if self._bg_base is None:
-                self.xprint('reset bg_base: %s bg_static: %s' % (self._bg_base, self._bg_static), always=False)
-                self._bg_base = self.fig.figure.canvas.copy_from_bbox(self.fig.figure.bbox)
-                self._bg_static = None
-                self.draw_state = self.DrawState.STATIC
-                #sleep(6)
-                self.xprint('', )
-                self.xprint('bg_base = copy_from_bbox <<<<<<<<<<<<<<<<', always=False)
-                self.xprint('', )
-                return 'bg_base = copy_from_bbox', None, self.draw_state.name
-            
-            # if we do not have a saved static background, then we need to draw the static artists
-            if self._bg_static is None:
-                # if we don't have a static background, restore the base, draw the static artists and
-                # save the background
-                self.draw_state = self.DrawState.STATIC
-                self.fig.canvas.restore_region(self._bg_base)
-                self.xprint('restore_region bg_base <<<<<<<<<<<<<<<< STATIC', always=False)
-                return 'restore_region bg_base', None, self.draw_state.name
-            
-            # if we have a static background, then we need to restore it and draw the dynamic artists
-            self.fig.canvas.restore_region(self._bg_static)
-            self.draw_state = self.DrawState.DYNAMIC
+            self._wait('draw')
+            self._canvas.draw_idle()
+            self.xprint('', )
+            self.xprint('bg_base draw_idle <<<<<<<<<<<<<<<<', always=False)
+            self.xprint('', )
+            return 'bg_base draw_idle', None, self.draw_state.name
+        
+        # redraw just the static artists passed to reset(scope='chrome'), if that is not possible
+        # all of the static artists are redrawn
+        chrome_bboxes = []
+        if self._chrome_artists:
+            if self._bg_static is not None:
+                chrome_bboxes = self._redraw_chrome()
+                if chrome_bboxes is None:
+                    self._bg_static = None
+            self._chrome_artists = ()
+
+        # if we do not have a saved static background, then we need to draw the static artists
+        if self._bg_static is None:
+            # if we don't have a static background, restore the base, draw the static artists and
+            # save the background
+            self.draw_state = self.DrawState.STATIC
+            self._restore_region(self._bg_base)
+            self.xprint('restore_region bg_base <<<<<<<<<<<<<<<< STATIC', always=False)
+            return 'restore_region bg_base', None, self.draw_state.name
+        
+        # if we have a static background, then we need to restore it and draw the dynamic artists,
+        # if we are tracking dirty axes only the regions and artists of the dirty axes are needed
+        bg_static = self._bg_static
+        if self.dirty_axes:
+            # nothing has been marked dirty since the last frame so there is nothing to restore, draw or blit
+            if not dirty_axes and not chrome_bboxes:
+                self.draw_state = self.DrawState.DONE
+                return 'unchanged', None, self.draw_state.name
+            if None not in dirty_axes and all(axes_id is not None for axes_id, b, region in bg_static):
+                bg_static = [r for r in bg_static if r[0] in dirty_axes]
+                self.dynamic_animated_artists = tuple(a for axes_id, b, region in bg_static for a in self._dynamic_by_axes.get(axes_id, ()))
+        restore_region = self._restore_region
+        for axes_id, b, region in bg_static:
+            restore_region(region)
+        self._blit_bboxes = [b for axes_id, b, region in bg_static] + chrome_bboxes
+        if self.blit_extents:
+            self._frame_extents = list(chrome_bboxes)
+        elif len(bg_static) > 1 and len(bg_static) == len(self._bg_static):
+            # every region is being redrawn, a single blit of the area covering them replaces 
+            # a blit per axes, the areas between the regions are unchanged so can be blitted
+            self._blit_bboxes = (Bbox.union(self._blit_bboxes), )
+        self.draw_state = self.DrawState.DYNAMIC
+        if self.debug:
             self.xprint('restore_region bg_static <<<<<<<<<<<<<<<< DYNAMIC', always=False)
-            return 'restore_region bg_static', None, self.draw_state.name
-    
-        # STATIC - draw the static artist and then save the background
-        if self.draw_state == self.DrawState.STATIC:
-            self.xprint("draw_animated: static_animated_artists: %s" % (len(self.static_animated_artists)), )
-            artist = self.draw_artists(self.static_animated_artists, info='static')
-            if artist is not None:
-                self.static_draws += 1
-                return artist, 'static', self.draw_state.name
-
-            self._bg_static = self.fig.figure.canvas.copy_from_bbox(self.fig.figure.bbox)
-            self.xprint('static_draws: %s' % (self.static_draws, ), always=False)
+        return 'restore_region bg_static', None, self.draw_state.name
+
+    # _redraw_chrome - redraw the static artists passed to reset(scope='chrome') on top of the current frame,
+    # the area covered by the last and current extent of each artist is restored from the base background 
+    # and the artist is drawn again. Returns the areas to blit, or None if an artist was not drawn as a 
+    # static Text on the last static frame or an area overlaps a dynamic region or another static artist.
+    def _redraw_chrome(self):
+        chrome = self._chrome_artists
+        chrome_ids = {id(a) for a in chrome}
+        renderer = self.fig._get_renderer()
+        bbox = self._bbox
+        static_extents = self._static_extents
+        areas = []
+        for a in chrome:
+            last_extent = static_extents.get(id(a))
+            if last_extent is None or not isinstance(a, Text):
+                return None
+            # pad by a pixel to allow for antialiasing and rounding to the pixel grid
+            area = Bbox.union([last_extent, a.get_window_extent(renderer)]).padded(1)
+            area = Bbox.intersection(area, bbox)
+            if area is not None:
+                x0, y0, x1, y1 = area.extents
+                areas.append(Bbox.from_extents(floor(x0), floor(y0), ceil(x1), ceil(y1)))
+        for axes_id, b, region in self._bg_static:
+            if any(area.overlaps(b) for area in areas):
+                return None
+        # the other static artists have not changed since they were drawn, use the extents recorded then
+        for aid, extent in static_extents.items():
+            if aid not in chrome_ids and any(area.overlaps(extent) for area in areas):
+                return None
+        # the partial restore bbox is in canvas buffer coordinates, y down from the top of the figure
+        restore_region = self._restore_region
+        bg_base = self._bg_base
+        height = bbox.height
+        for area in areas:
+            x0, y0, x1, y1 = area.extents
+            restore_region(bg_base, bbox=(x0, height - y1, x1, height - y0), xy=(0, 0))
+        for a in chrome:
+            self._draw_artist(a)
+            static_extents[id(a)] = a.get_window_extent(renderer)
+        self.static_draws += len(chrome)
+        return areas
+
+    # _bg_size_changed - the figure size no longer matches the saved backgrounds, drop them and 
+    # ask for the figure to be drawn, the draw event saves a new base background at the new size.
+    # N.b. on a non-interactive canvas draw_idle() draws immediately and the draw event has 
+    # already moved us to RESET when it returns
+    def _bg_size_changed(self):
+        self.xprint('bg_size changed: %s %s', self._bg_size, self._bbox.size, always=False)
+        self._bg_base = self._bg_static = None
+        self._artists_dirty = True
+        self._bind_canvas()
+        self._wait('draw')
+        self._canvas.draw_idle()
+        return 'bg_size changed', None, self.draw_state.name
+
+    # STATIC - draw the static artist and then save the background
+    def _draw_static(self, flush_events, budget, artists_per_tick):
+        if self.debug:
+            self.xprint("draw_animated: static_animated_artists: %s", len(self.static_animated_artists), )
+        artist, count = self.draw_artists(self.static_animated_artists, info='static', budget=budget, artists_per_tick=artists_per_tick, )
+        if artist is not None:
+            self.static_draws += count
+            return artist, 'static', self.draw_state.name
+
+        # save the background of just the regions the dynamic artists draw into
+        bbox = self._bbox
+        if self._bg_size != (bbox.width, bbox.height):
+            return self._bg_size_changed()
+        copy_from_bbox = self._copy_from_bbox
+        self._bg_static = [(axes_id, b, copy_from_bbox(b)) for axes_id, b in self._dynamic_bboxes(bbox) if b is not None]
+        # the extents of the static artists are needed to redraw Text artists after reset(scope='chrome'), they 
+        # are recorded once here as get_tightbbox() lays out the ticks of the XAxis and YAxis again
+        renderer = self.fig._get_renderer()
+        static_extents = self._static_extents = {}
+        for a in self.static_animated_artists:
+            extent = a.get_window_extent(renderer) if isinstance(a, Text) else a.get_tightbbox(renderer)
+            if extent is not None:
+                static_extents[id(a)] = extent
+        if self.debug:
+            self.xprint('static_draws: %s', self.static_draws, always=False)
             self.xprint('bg_static = copy_from_bbox <<<<<<<<<<<<<<<<', always=False)
 
-            self.draw_state = self.DrawState.DYNAMIC
-            return 'bg_static = copy_from_bbox', None, self.draw_state.name
-
-        # DYNAMIC - draw the dynamic artists
-        if self.draw_state == self.DrawState.DYNAMIC:
-            self.xprint("draw_animated: dynamic_animated_artists: %s" % (len(self.dynamic_animated_artists)), )
-            artist = self.draw_artists(self.dynamic_animated_artists, info='dynamic' )
-            if artist is not None:
-                self.dynamic_draws += 1
-                return artist, 'dynamic', self.draw_state.name
-            self.draw_state = self.DrawState.BLIT
-            self.xprint('dynamic_draws: %s' % (self.dynamic_draws, ), always=False)
-            return 'dynamic', None, self.draw_state.name
-
-        # BLIT - blit the canvas
-        if self.draw_state == self.DrawState.BLIT:
-            self.fig.figure.canvas.blit(self.fig.figure.bbox)
-            self.draw_state = self.DrawState.CLEANUP
-            return 'blit', None, self.draw_state.name
-
-        # CLEANUP - cleanup the blit times and calculate the fps
-        if self.draw_state == self.DrawState.CLEANUP:
-            self.draw_state = self.DrawState.FLUSH if flush_events else self.DrawState.DONE
-            current_time = perf_counter()
-            self.blit_times.append((current_time, self.static_draws, self.dynamic_draws))
-            delete_time = current_time - 120.
-            blit_times = [ t for t in self.blit_times if t[0] > delete_time]
-            self.blit_times = blit_times
-            elapsed = self.blit_times[-1][0] - self.blit_times[0][0]
-            self._fps = len(self.blit_times) / elapsed if elapsed > 0. else 0.
-            self.avg_static_draws = sum([t[1] for t in self.blit_times]) / len(self.blit_times)
-            self.avg_dynamic_draws = sum([t[2] for t in self.blit_times]) / len(self.blit_times)
-            self.fps_info = (self._fps, self.static_artists, self.dynamic_artists, self.avg_static_draws, self.avg_dynamic_draws)
-            self.xprint('static_draws: %s dynamic_draws: %s' % (self.static_draws, self.dynamic_draws, ), always=False)
-            self.xprint('cleanup bg_base: %s bg_static: %s' % (self._bg_base, self._bg_static), always=False)
-            return 'cleanup', None, self.draw_state.name
-
-        if self.draw_state == self.DrawState.FLUSH:
-            # optionally let the GUI event loop process anything it has to do
-            self.fig.canvas.flush_events()
-            self.draw_state = self.DrawState.DONE
-            return 'FLUSH', None, self.draw_state.name
-
-        if self.draw_state == self.DrawState.DONE:
-            self.draw_state = self.DrawState.START
+        self.draw_state = self.DrawState.DYNAMIC
+        self._draw_idx = 0
+        return 'bg_static = copy_from_bbox', None, self.draw_state.name
+
+    # DYNAMIC - draw the dynamic artists
+    def _draw_dynamic(self, flush_events, budget, artists_per_tick):
+        if self.debug:
+            self.xprint("draw_animated: dynamic_animated_artists: %s", len(self.dynamic_animated_artists), )
+        draw_idx = self._draw_idx
+        artist, count = self.draw_artists(self.dynamic_animated_artists, info='dynamic', budget=budget, artists_per_tick=artists_per_tick, )
+        if self.blit_extents:
+            self._add_extents(self.dynamic_animated_artists[draw_idx:self._draw_idx])
+        if artist is not None:
+            self.dynamic_draws += count
+            return artist, 'dynamic', self.draw_state.name
+        self.draw_state = self.DrawState.BLIT
+        if self.debug:
+            self.xprint('dynamic_draws: %s', self.dynamic_draws, always=False)
+        return 'dynamic', None, self.draw_state.name
+
+    # _add_extents - record the extents of the dynamic artists just drawn, on a dynamic frame the
+    # previous extent of each artist is also added to the frame extents as it has been erased
+    def _add_extents(self, artists):
+        renderer = self.fig._get_renderer()
+        artist_extents = self._artist_extents
+        frame_extents = self._frame_extents
+        for a in artists:
+            # a removed artist is not drawn but the area it was last drawn in has been erased
+            if a.figure is None:
+                last_extent = artist_extents.pop(id(a), None)
+                if frame_extents is not None and last_extent is not None:
+                    frame_extents.append(last_extent)
+                continue
+            extent = _artist_extent(a, renderer)
+            if extent is not None:
+                extent = extent.padded(_EXTENT_PAD)
+            if frame_extents is not None:
+                last_extent = artist_extents.get(id(a))
+                if last_extent is not None:
+                    frame_extents.append(last_extent)
+                if extent is not None:
+                    frame_extents.append(extent)
+            artist_extents[id(a)] = extent
+
+    # BLIT - blit the canvas, if blit_extents is set a dynamic frame only blits the part of each 
+    # region covered by the frame extents, a region with no extents has not changed
+    def _draw_blit(self, flush_events, budget, artists_per_tick):
+        blit = self._blit
+        frame_extents = self._frame_extents
+        for b in self._blit_bboxes:
+            if frame_extents is not None:
+                extents = [e for e in frame_extents if b.overlaps(e)]
+                if not extents:
+                    continue
+                b = Bbox.intersection(Bbox.union(extents), b)
+                if b is None:
+                    continue
+            blit(b)
+        self.draw_state = self.DrawState.CLEANUP
+        return 'blit', None, self.draw_state.name
+
+    # CLEANUP - cleanup the blit times and calculate the fps
+    def _draw_cleanup(self, flush_events, budget, artists_per_tick):
+        self.draw_state = self.DrawState.FLUSH if flush_events else self.DrawState.DONE
+        self._frame_extents = None
+        # keep the last 120 seconds of blit times with running sums of the draw counts
+        current_time = perf_counter()
+        blit_times = self.blit_times
+        blit_times.append((current_time, self.static_draws, self.dynamic_draws))
+        self._sum_static_draws += self.static_draws
+        self._sum_dynamic_draws += self.dynamic_draws
+        delete_time = current_time - 120.
+        while blit_times[0][0] <= delete_time:
+            t, static_draws, dynamic_draws = blit_times.popleft()
+            self._sum_static_draws -= static_draws
+            self._sum_dynamic_draws -= dynamic_draws
+        elapsed = blit_times[-1][0] - blit_times[0][0]
+        self._fps = len(blit_times) / elapsed if elapsed > 0. else 0.
+        self.avg_static_draws = self._sum_static_draws / len(blit_times)
+        self.avg_dynamic_draws = self._sum_dynamic_draws / len(blit_times)
+        self.fps_info = (self._fps, self.static_artists, self.dynamic_artists, self.avg_static_draws, self.avg_dynamic_draws)
+        if self.debug:
+            self.xprint('static_draws: %s dynamic_draws: %s', self.static_draws, self.dynamic_draws, always=False)
+            self.xprint('cleanup bg_base: %s bg_static: %s', self._bg_base, self._bg_static, always=False)
+        return 'cleanup', None, self.draw_state.name
+
+    # FLUSH - optionally let the GUI event loop process anything it has to do
+    def _draw_flush(self, flush_events, budget, artists_per_tick):
+        self._flush_events()
+        self.draw_state = self.DrawState.DONE
+        return 'FLUSH', None, self.draw_state.name
+
+    # DONE - the frame is complete, the next call will start a new frame
+    def _draw_done(self, flush_events, budget, artists_per_tick):
+        self.draw_state = self.DrawState.START
+        return None, None, self.draw_state.name
+
+    # draw - do the next step of the animation, the static and dynamic steps will draw
+    # artists until budget seconds have been used or artists_per_tick artists have been drawn
+    def draw(self, flush_events=False, budget=0.002, artists_per_tick=0, ):
+        if self.debug:
+            self.xprint("draw: draw_state: %s", self.draw_state, always=False,)
+        draw_step = self._draw_dispatch.get(self.draw_state)
+        if draw_step is None:
             return None, None, self.draw_state.name
-
-    def xdraw_loop(self, pause_time=0.01, sleep_time=0., flush_events=True ):
-        elapsed = 0
+        return draw_step(flush_events, budget, artists_per_tick)
+
+    # draw_frame - draw the rest of the current frame, or a complete frame, in one call without returning
+    # between the steps, the static and dynamic artists are each drawn in a single step. 
+    # Returns True when the frame is done or False if it is waiting for a resize to finish.
+    # N.b. the GUI event loop does not run until the frame is finished unless flush_events is set
+    def draw_frame(self, flush_events=False, ):
+        draw = self.draw
+        profile_draw_times = self.profile_draw_times
         while True:
-            with self.drawtimes as dt:
-                dt.name, dt.type, next_state = self.draw(flush_events=flush_events,)
-            #print('draw: %s %s %s' % (dt.name, dt.type, next_state), file=sys.stderr)
-            if dt.name is None:
+            if profile_draw_times:
+                t0 = perf_counter_ns()
+            name, type, next_state = draw(flush_events=flush_events, budget=None, )
+            if name is None:
                 return True
-            elapsed += self.drawtimes.elapsed
-            if elapsed > pause_time:
+            if profile_draw_times and type is None:
+                t1 = perf_counter_ns()
+                self.drawtimes.add(name, type, t1 - t0, t1)
+            if next_state == self.DrawState.WAITING.name:
                 return False
-            if sleep_time > 0.:
-                sleep(sleep_time)
 
     # draw_loop - call draw until it returns None then return True,
-    # if the the elapsed time is greater than pause_time sleep or return False
-    def draw_loop(self, pause_time=0.01, flush_events=True, sleep_time=0.): 
-        elapsed = 0
+    # once pause_time has passed run the GUI event loop for sleep_time between steps or if sleep_time is 0 
+    # return False. The canvas event loop lets the GUI process events and paint while waiting, time.sleep() 
+    # would block it and on some platforms has a much coarser resolution.
+    # N.b. artist draws are recorded in drawtimes by draw_artists, only the other steps are recorded here,
+    # nothing is recorded if open() was called with profile_draw_times=False
+    # N.b. each draw() call batches artists until budget seconds have been used, by default a quarter 
+    # of pause_time so a frame needs only a few calls but the GUI still gets regular chances to run,
+    # a budget of None does not limit the time
+    def draw_loop(self, pause_time=0.01, flush_events=True, sleep_time=0., budget=_PAUSE_BUDGET, artists_per_tick=0, ): 
+        if budget is _PAUSE_BUDGET:
+            budget = pause_time / 4
+        profile_draw_times = self.profile_draw_times
+        deadline = perf_counter_ns() + int(pause_time * 1e9)
         while True:
-            with self.drawtimes as dt:
-                dt.name, dt.type, next_state = self.draw(flush_events=flush_events, )
-                if dt.name is None:
-                    return True
-                elapsed += dt.elapsed 
-                #if next_state == self.DrawState.WAITING.name:
-                #    sleep(1)
-                #    return False
-                if elapsed > 0.01:
-                    if sleep_time > 0.:
-                        sleep(sleep_time)
-                    else:
-                        return False
+            if profile_draw_times:
+                t0 = perf_counter_ns()
+            name, type, next_state = self.draw(flush_events=flush_events, budget=budget, artists_per_tick=artists_per_tick, )
+            if name is None:
+                return True
+            t1 = perf_counter_ns()
+            if profile_draw_times and type is None:
+                self.drawtimes.add(name, type, t1 - t0, t1)
+            # let the caller run the GUI event loop so that the resize can finish
+            if next_state == self.DrawState.WAITING.name:
+                return False
+            if t1 >= deadline:
+                if sleep_time > 0.:
+                    self._pause(sleep_time)
+                else:
+                    return False
             #count += 1
             #tmc.count = count
             #if draw_time is None:
@@ -424,6 +905,7 @@ class DrawAnimated:
 
 # an example of using DrawAnimated to animate a matplotlib plot
 #
+
 if __name__ == "__main__":
 
     print('matplotlib version: %s' % (matplotlib.__version__), )
@@ -433,33 +915,40 @@ if __name__ == "__main__":
     fig, axes_dict = plt.subplot_mosaic([['a', 'b'], ['c', 'd']], constrained_layout=True, figsize=(8, 8))
 
     # setup 4 lines and 2 annotations on each subplot axes, ensure everything is animated
-    lines = {n: {} for n in axes_dict.keys()}
+    lines = {n: None for n in axes_dict.keys()}
     annotations = { a: {'frame_number': None, 'fps': None} for a in axes_dict.keys()}
     legends = {n: None for n in axes_dict.keys()}
     colors = ['red', 'blue', 'green', 'brown']
 
     drawanimated = DrawAnimated(fig, )
-    drawanimated.open(xaxis_dynamic=False, yaxis_dynamic=False, extra_static_artists=[], debug=False, name='test', )
-    drawtimes = DrawTimes()
+    drawanimated.open(xaxis_dynamic=False, yaxis_dynamic=False, extra_static_artists=[], debug=False, name='test', dirty_axes=True, )
+
+    # the x data and the per line offsets and frequencies are the same for all axes and frames
+    x = np.linspace(0, 2 * np.pi, 100, dtype=np.float32)
+    line_offsets = np.arange(len(colors), dtype=np.float32) * 10
+    line_freqs = np.float32(np.pi) / np.arange(1, len(colors) + 1, dtype=np.float32)
 
     for name, ax in axes_dict.items():
         drawanimated.animate_chrome(ax, name=name, title=f"Draw Animated Incremental {name}", )
-        # create the 4 line plots
-        x = np.linspace(0, 2 * np.pi, 100)
-        for c in colors:
-            line, = ax.plot(x, np.sin(x), animated=True, label=f"{name}-{c}", color=c, )
-            lines[name][c] = line
-
-        # create the 2 annotations
+        # create the 4 line plots as a single LineCollection, one artist to draw per axes instead of 
+        # one per line, the colors are set per line
+        lc = LineCollection([np.column_stack((x, np.sin(x)))] * len(colors), colors=colors, animated=True, label=f"{name}-lines", )
+        ax.add_collection(lc)
+        ax.autoscale_view()
+        lines[name] = lc
+
+        # create the 2 annotations, clip them to the axes so only the axes regions need to be 
+        # restored and blitted for each frame
         for annotation, xytext in [('frame_number', (10, -10)), ('fps', (200, -10))]:
             annotations[name][annotation] = ax.annotate( 
                 annotation, (0, 1), xycoords="axes fraction", xytext=xytext, 
                 textcoords="offset points", ha="left", va="top", label=f"{annotation}-an", 
-                animated=True, )
+                animated=True, clip_on=True, )
 
         # create the legend, note that the ax.legend call does not take the animated parameter, 
-        # need to set it explicitly
-        leg = ax.legend(handles=lines[name].values(), loc='lower right', )
+        # need to set it explicitly, the lines are in one collection so use a proxy handle per color
+        handles = [Line2D([], [], color=c, label=f"{name}-{c}", ) for c in colors]
+        leg = ax.legend(handles=handles, loc='lower right', )
         leg.set_animated(True)
         leg.set_label('legend')
         legends[name] = leg
@@ -469,36 +958,51 @@ if __name__ == "__main__":
     fig.show()
     #plt.pause(0.001)
 
+    # precompute the ydata for every frame and line, shape is (frames, lines, points),
+    # the multiplier is bumped by 1.2 every 80 frames to force the ylimits to change
+    num_frames = 500
+    divisor = 100
+    js = np.arange(num_frames, dtype=np.float32)[:, None, None]
+    phase = (js / divisor) * line_freqs[None, :, None]
+    multipliers = (1.2 ** (np.arange(num_frames) // 80 + 1)).astype(np.float32)
+    ydata_table = np.sin(x[None, None, :] + line_offsets[None, :, None] + phase) * multipliers[:, None, None]
+    ymin_table = ydata_table.min(axis=(1, 2))
+    ymax_table = ydata_table.max(axis=(1, 2))
+
+    # the line segments for every frame, shape is (frames, lines, points, 2), the x data is the same for all
+    segments_table = np.empty(ydata_table.shape + (2,), dtype=np.float32)
+    segments_table[..., 0] = x
+    segments_table[..., 1] = ydata_table
+
     start_time = time()
     frame_count = 0
-    divisor = 100
-    multiplier = 1
+    fps_text = None
     resets = 0 
     reset = False
     force = False
-    for j in range(500):
+    for j in range(num_frames):
 
-        if j % 80 == 0:
-            multiplier *= 1.2
-        
-        for i, (name, ax) in enumerate(axes_dict.items()):
-            ymin = []
-            ymax = []
-            for k, (color, line) in enumerate(lines[name].items()):
-                offset = k * 10
-                ydata = np.sin(x + offset + (j / divisor) * np.pi / (k+1)) * multiplier 
-                ymin.append(min(ydata))
-                ymax.append(max(ydata))
-                line.set_ydata(ydata)
-            annotations[name]['frame_number'].set_text("frame: %d" % (frame_count,))
+        segments = segments_table[j]
+
+        # the annotation text is the same for all axes, the fps is only updated every 10 frames,
+        # set_text forces the text layout to be redone so skip it if the text has not changed
+        frame_text = "frame: %d" % (frame_count,)
+        if frame_count % 10 == 0:
             elapsed = time() - start_time
             if elapsed > 0:
-                annotations[name]['fps'].set_text("fps: %3.1f" % (frame_count / elapsed))
+                fps_text = "fps: %3.1f" % (frame_count / elapsed)
+
+        for i, (name, ax) in enumerate(axes_dict.items()):
+            lines[name].set_segments(segments)
+            for annotation, text in (('frame_number', frame_text), ('fps', fps_text)):
+                if text is not None and text != annotations[name][annotation].get_text():
+                    annotations[name][annotation].set_text(text)
+            drawanimated.mark_dirty(ax)
 
             if j % 80 == 0:
 
-                min_y = min(ymin)
-                max_y = max(ymax)
+                min_y = ymin_table[j]
+                max_y = ymax_table[j]
                 ylims = ax.get_ylim()
 
                 if min_y < ylims[0] or max_y > ylims[1]:
@@ -516,14 +1020,20 @@ if __name__ == "__main__":
             for name, ax in axes_dict.items():
                 ax.set_title(f"Draw Animated Incremental {name} {resets}")
             #self._draw_reset = True
-            drawanimated.reset('main')
+            # the limits have changed, the existing animated artists are unchanged
+            drawanimated.reset('main', scope='limits')
+        elif j % 50 == 25:
+            # only the titles have changed, just redraw them rather than all of the static artists
+            for name, ax in axes_dict.items():
+                ax.set_title(f"Draw Animated Incremental {name} {resets} frame {j}")
+            drawanimated.reset('titles', scope='chrome', artists=[ax.title for ax in axes_dict.values()])
 
-        # update, this is a loop so GUI can process events
-        drawanimated.draw_loop(pause_time=0.01, sleep_time=0.001 )
+        # update, this is a loop so GUI can process events, the event loop is run once 
+        # per frame below so the draw loop does not need to flush them as well
+        drawanimated.draw_loop(pause_time=0.01, sleep_time=0.001, flush_events=False, )
         frame_count += 1
-        fig.canvas.flush_events()
         print('frame: %d' % (frame_count,), file=sys.stderr) 
-        sleep(.0001)
+        drawanimated.pause(.0001)
 
     drawanimated.close()
 
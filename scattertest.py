@@ -40,6 +40,14 @@ if __name__ == '__main__':
     # create scatter plot, set animated=True 
     sc = ax.scatter([],[], color='black', animated=True)
 
+    # the offsets for all of the samples, each frame plots the first idx of them so the frame
+    # offsets are just a slice, the running min/max of y give the y limits for each frame
+    offsets = np.empty((len(sample_x), 2))
+    offsets[:, 0] = sample_x
+    offsets[:, 1] = sample_y
+    running_ymin = np.minimum.accumulate(offsets[:, 1])
+    running_ymax = np.maximum.accumulate(offsets[:, 1])
+
     for force in [False, True]:
         # draw the initial plot, effectively just a blank plot
         if force:
@@ -57,16 +65,15 @@ if __name__ == '__main__':
             t1 = time.perf_counter()
 
             # get x and y we want to plot, update scatter plot using set_offsets
-            x = sample_x[:idx]
-            y = sample_y[:idx]
-            sc.set_offsets(np.c_[x,y])
+            sc.set_offsets(offsets[:idx])
 
             # get the new limits of the plot and update if necessary,
             # if changed set fig._draw_reset = True to force the axes to be redrawn
             # To see the effect of not redrawing the axes, set the following to False
             if True:
-                xlims = (min(x),max(x))
-                ylims = (min(y),max(y))
+                # sample_x is increasing so the x limits are the first and last x
+                xlims = (sample_x[0], sample_x[idx - 1])
+                ylims = (running_ymin[idx - 1], running_ymax[idx - 1])
             else:
                 xlims = (min(sample_x), max(sample_x))
                 ylims = (min(sample_y), max(sample_y))
@@ -83,20 +90,21 @@ if __name__ == '__main__':
                 xlims = (xlims[0], xlims[1]+1000)
                 ax.set_xlim(xlims)
                 fig._draw_reset = True
-                drawanimated.reset('xlims')
+                drawanimated.reset('xlims', scope='limits')
                 last_xlims = xlims
                 lims_changed += 1
 
             if last_ylims is None or last_ylims != ylims:
                 ax.set_ylim(ylims)
-                drawanimated.reset('ylims')
+                drawanimated.reset('ylims', scope='limits')
                 last_ylims = ylims
                 lims_changed += 1
 
             if force:
                 drawanimated.reset('force')
-            # incrementally draw the plot
-            drawanimated.draw_loop(pause_time=0.01, sleep_time=0.001)
+            # draw the frame in one call, if it is waiting for a resize or redraw let the GUI run and try again
+            while not drawanimated.draw_frame(flush_events=True, ):
+                drawanimated.pause(0.001)
 
             fps.append(1/(time.perf_counter()-t1))
             #print('Mean Frame Rate: %.3gFPS' % (1/(time.perf_counter()-t1)), file=sys.stderr)